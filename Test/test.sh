@@ -1 +1,2 @@
 python ../event_display_protoND_raw.py MINERvA_2x2_100evt.root -e 0 -l
+python ../event_display_protoND_thumbnails.py MINERvA_2x2_100evt.root -l -o thumbnails
@@ -0,0 +1,271 @@
+import argparse
+import json
+import math
+import numpy as np
+import os
+import platform
+import resource
+import tempfile
+import time
+import ROOT
+import pdg_colors
+
+
+
+#### import the simple module from the paraview
+from paraview.simple import *
+import paraview.servermanager
+
+
+
+#### load arguments
+parser = argparse.ArgumentParser(description="Offscreen render benchmark, run with pvbatch (or pvpython --force-offscreen-rendering).")
+parser.add_argument("-r", "--root_file",    default=None,                   help="Use the hits of a real event instead of synthetic ones.")
+parser.add_argument("-e", "--event",        default="0",                    help="Select the event number. Default: %(default)s.",                           type=int)
+parser.add_argument("-c", "--color",        default="dq",                   help="Select the tree entry to use as color. Default: %(default)s.")
+parser.add_argument("-l", "--logscale",     action='store_true',            help="Use logarithmic scaled colorbar.")
+parser.add_argument("-n", "--points",       default=[1000, 10000, 100000, 1000000], nargs='+', help="Select the point counts. Default: %(default)s.", type=int)
+parser.add_argument("-f", "--frames",       default="120",                  help="Select the number of orbit frames per point count. Default: %(default)s.", type=int)
+parser.add_argument("-o", "--output",       default="benchmark.json",       help="Select the output file. Default: %(default)s.")
+parser.add_argument("-b", "--baseline",     default=None,                   help="Compare with a previous output file.")
+args = parser.parse_args()
+
+
+
+#### memory
+def rss_mb():
+    """Current resident set size [MB]."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return float(line.split()[1])/1024.
+    return float("nan")
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far [MB]."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024.
+
+
+
+#### prepare data
+def read_event(root_file_name, event, color):
+    """Same selection as event_display_protoND_raw.py, returns (N,4) array of x,y,z,c."""
+    root_file = ROOT.TFile(root_file_name, "READ")
+    data = np.zeros(0)
+    try:
+        tree = root_file.Get("argon")
+        tree.SetBranchStatus("*", 1)
+
+        for i in range(tree.GetEntries()):
+
+            tree.GetEntry(i)
+
+            if tree.ev != event:
+                continue
+
+            if "q" in color:
+                data =  np.append(data,np.transpose(np.vstack((tree.xq, tree.yq, tree.zq, getattr(tree, color)))))
+            else:
+                data =  np.append(data,np.transpose(np.vstack((tree.xq, tree.yq, tree.zq, np.full(tree.nq, getattr(tree, color))))))
+
+        data = np.reshape(data,(-1,4))
+
+    finally:
+        root_file.Close()
+
+    return data
+
+def make_points(n, event_data=None, seed=0):
+    """n hits, resampled from a real event if given, otherwise uniform in the 2x2 modules."""
+    rng = np.random.RandomState(seed)
+
+    if event_data is not None and len(event_data):
+        return event_data[rng.randint(0, len(event_data), n)]
+
+    data = np.empty((n,4))
+    data[:,:3] = rng.uniform(-70., 70., (n,3))
+    if args.color == "pidq":
+        data[:,3] = rng.choice([-211, -13, 11, 13, 211, 2212], n)
+    else:
+        data[:,3] = rng.exponential(1., n)
+    return data
+
+
+
+#### build scene
+render_view = CreateView("RenderView")
+render_view.ViewSize = [1920, 1080]
+render_view.Background = [0.4, 0.4, 0.4]
+SetActiveView(render_view)
+
+# Draw detector
+#===============
+# (XLength, YLength, ZLength, Center, Representation, Opacity), same boxes as event_display_protoND_raw.py
+boxes  = [(70., 70., 140., [-35.+float(i)%2.*70., -35.+math.floor(float(i)/2.)*70., 0.], 'Wireframe', 1.0) for i in range(4)]   # modules
+boxes += [(33., 68., 138., [-52.5+float(i)%4.*35., -35.+math.floor(float(i)/4.)*70., 0.], 'Surface', 0.2) for i in range(8)]    # TPCs
+boxes += [(140., 4., 140., [0., 117.5+float(i)*4., 0.], 'Surface', 0.2) for i in range(12)]                                     # Tracker
+boxes += [(140., 0.2, 140., [0., 163.6+float(i)*2.2, 0.], 'Surface', 0.5) for i in range(20)]                                   # ECal
+boxes += [(140., 2.0, 140., [0., 164.7+float(i)*2.2, 0.], 'Surface', 0.2) for i in range(20)]
+boxes += [(140., 2.54, 140., [0., 208.77+float(i)*4.54, 0.], 'Surface', 0.5) for i in range(20)]                                # HCal
+boxes += [(140., 2.0, 140., [0., 211.04+float(i)*4.54, 0.], 'Surface', 0.2) for i in range(20)]
+
+cube = []
+for x_length, y_length, z_length, center, representation, opacity in boxes:
+    cube.append(Box(XLength=x_length, YLength=y_length, ZLength=z_length, Center=center))
+    acubeDisplay = Show(cube[-1], render_view)
+    acubeDisplay.Representation = representation
+    acubeDisplay.ColorArrayName = [None, '']
+    acubeDisplay.Opacity = opacity
+    acubeDisplay.AmbientColor = [1.0, 1.0, 1.0]
+
+# Define orbit
+#==============
+# same key frames as the '--animation' block of event_display_protoND_raw.py
+animation_scene = GetAnimationScene()
+animation_scene.PlayMode = 'Sequence'
+animation_scene.StartTime = 0.
+animation_scene.EndTime = 1.
+animation_scene.NumberOfFrames = args.frames
+
+camera_cue = GetCameraTrack(view=render_view)
+
+keyFrame5304 = CameraKeyFrame()
+keyFrame5304.Position = [2732.0508075688776, 0.0, 0.0]
+keyFrame5304.FocalPoint = [-1e-20, 0.0, 0.0]
+keyFrame5304.ViewUp = [0.0, 0.0, 1.0]
+keyFrame5304.ParallelScale = 1.
+keyFrame5304.PositionPathPoints = [1500.0, 0.0, 0.0, 943.9805865747562, 1165.7189421854564, 0.0, -311.867536226639, 1467.2214011007086, 0.0, -1336.5097862825519, 680.9857496093204, 0.0, -1370.3181864639016, -610.1049646137003, 0.0, -388.22856765378134, -1448.8887394336025, 0.0, 881.6778784387096, -1213.5254915624214, 0.0]
+keyFrame5304.FocalPathPoints = [0.0, 0.0, 0.0]
+keyFrame5304.ClosedPositionPath = 1
+
+keyFrame5305 = CameraKeyFrame()
+keyFrame5305.KeyTime = 1.0
+keyFrame5305.Position = [2732.0508075688776, 0.0, 0.0]
+keyFrame5305.FocalPoint = [-1e-20, 0.0, 0.0]
+keyFrame5305.ViewUp = [0.0, 0.0, 1.0]
+keyFrame5305.ParallelScale = 1.
+
+camera_cue.Mode = 'Path-based'
+camera_cue.KeyFrames = [keyFrame5304, keyFrame5305]
+
+render_view.CameraPosition = [2732.0508075688776, 0.0, 0.0]
+render_view.CameraFocalPoint = [-1e-20, 0.0, 0.0]
+render_view.CameraViewUp = [0.0, 0.0, 1.0]
+render_view.CameraParallelScale = 1.
+
+Render(render_view)
+
+
+
+#### benchmark
+def run(n, event_data):
+    data = make_points(n, event_data)
+
+    csv_header = "x,y,z,c"
+    if args.color == "pidq":
+        data = np.column_stack((data, pdg_colors.pdg_columns(data[:,3])))
+        csv_header += "," + pdg_colors.pdg_header
+
+    csv_file = tempfile.NamedTemporaryFile(mode="w", delete=False)
+    try:
+        np.savetxt(csv_file, data, delimiter=",", comments="", header=csv_header)
+        csv_file.close()
+
+        # load data into paraview, same pipeline as event_display_protoND_raw.py
+        t_start = time.time()
+        pv_csv = CSVReader(FileName=[csv_file.name])
+        data_table = TableToPoints(Input=pv_csv)
+        data_table.XColumn = "x"
+        data_table.YColumn = "z"
+        data_table.ZColumn = "y"
+        shown = data_table
+        if args.color == "pidq":
+            shown = pdg_colors.pdg_color_source(data_table)
+        shown.UpdatePipeline()
+        t_update = time.time() - t_start
+
+        if args.color == "pidq":
+            pdg_colors.show_pdg_colors(shown, render_view)
+        else:
+            data_display = Show(data_table, render_view)
+            ColorBy(data_display, ("POINTS", "c"))
+            data_display.RescaleTransferFunctionToDataRange(True, False)
+            data_display.SetScalarBarVisibility(render_view, True)
+            color_lut = GetColorTransferFunction("c")
+            color_lut.UseLogScale = 1 if args.logscale else 0
+            color_lut.ApplyPreset('jet', True)
+
+        # time to first frame
+        animation_scene.AnimationTime = 0.
+        Render(render_view)
+        t_first = time.time() - t_start
+
+        # orbit
+        frames = []
+        for i in range(args.frames):
+            t_frame = time.time()
+            animation_scene.AnimationTime = float(i)/args.frames
+            Render(render_view)
+            frames.append(time.time() - t_frame)
+
+        Hide(shown, render_view)
+        if shown is not data_table:
+            Delete(shown)
+        Delete(data_table)
+        Delete(pv_csv)
+
+    finally:
+        os.remove(csv_file.name)
+
+    frames = np.array(frames)
+    return {
+        "points":           n,
+        "pipeline_update_s": t_update,
+        "first_frame_s":    t_first,
+        "frame_mean_s":     frames.mean(),
+        "frame_median_s":   np.median(frames),
+        "frame_p95_s":      np.percentile(frames, 95),
+        "fps":              1./np.median(frames),
+        "rss_mb":           rss_mb(),
+        "peak_rss_mb":      peak_rss_mb(),
+        "frames_s":         frames.tolist(),
+    }
+
+event_data = read_event(args.root_file, args.event, args.color) if args.root_file else None
+
+results = {
+    "host":         platform.node(),
+    "paraview":     "%d.%d" % (paraview.servermanager.vtkSMProxyManager.GetVersionMajor(), paraview.servermanager.vtkSMProxyManager.GetVersionMinor()),
+    "software_gl":  os.environ.get("LIBGL_ALWAYS_SOFTWARE", "") == "1",
+    "view_size":    list(render_view.ViewSize),
+    "source":       "%s:%d" % (args.root_file, args.event) if args.root_file else "synthetic",
+    "color":        args.color,
+    "logscale":     args.logscale,
+    "frames":       args.frames,
+    "runs":         [],
+}
+
+# ascending, so that the peak RSS is attributed to the largest point count seen so far
+for n in sorted(args.points):
+    results["runs"].append(run(n, event_data))
+    r = results["runs"][-1]
+    print("%9d points: update %7.3f s, first frame %7.3f s, frame %7.2f ms (p95 %7.2f ms), RSS %7.1f MB (peak %7.1f MB)" % (
+        n, r["pipeline_update_s"], r["first_frame_s"], r["frame_median_s"]*1e3, r["frame_p95_s"]*1e3, r["rss_mb"], r["peak_rss_mb"]))
+
+with open(args.output, "w") as output_file:
+    json.dump(results, output_file, indent=1)
+
+
+
+#### compare with a previous run
+if args.baseline:
+    with open(args.baseline) as baseline_file:
+        baseline = dict((r["points"], r) for r in json.load(baseline_file)["runs"])
+
+    for r in results["runs"]:
+        if r["points"] not in baseline:
+            continue
+        b = baseline[r["points"]]
+        print("%9d points: update x%5.2f, first frame x%5.2f, frame x%5.2f, peak RSS x%5.2f" % (
+            r["points"], r["pipeline_update_s"]/b["pipeline_update_s"], r["first_frame_s"]/b["first_frame_s"],
+            r["frame_median_s"]/b["frame_median_s"], r["peak_rss_mb"]/b["peak_rss_mb"]))
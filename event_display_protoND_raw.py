@@ -4,6 +4,7 @@ import numpy as np
 import os
 import tempfile
 import ROOT
+import pdg_colors
 
 
 
@@ -61,10 +62,18 @@ finally:
 
 
 
+# PDG classes and colors are mapped once here instead of through the lookup table
+csv_header = "x,y,z,c"
+if args.color == "pidq":
+    data = np.column_stack((data, pdg_colors.pdg_columns(data[:,3])))
+    csv_header += "," + pdg_colors.pdg_header
+
+
+
 #### load date into paraview
 csv_file = tempfile.NamedTemporaryFile(mode="w", delete=False)
 try:
-    np.savetxt(csv_file, data, delimiter=",", comments="", header="x,y,z,c")
+    np.savetxt(csv_file, data, delimiter=",", comments="", header=csv_header)
     csv_file.close()
     pv_csv = CSVReader(FileName=[csv_file.name])
 
@@ -85,45 +94,23 @@ finally:
 
 # Define coloring
 #=================
-ColorBy(data_display, ("POINTS", "c"))
-data_display.RescaleTransferFunctionToDataRange(True, False)
-data_display.SetScalarBarVisibility(render_view, True)
-color_lut = GetColorTransferFunction("c")
-
-if args.logscale:
-    color_lut.UseLogScale = 1
-else:
-    color_lut.UseLogScale = 0
-
 if args.color == "pidq":
+    # per point RGB from pdg_colors, no scalar mapping, categorical legend
+    Hide(data_table, render_view)
+    pid_colors = pdg_colors.pdg_color_source(data_table)
+    pdg_colors.show_pdg_colors(pid_colors, render_view)
 
-    rgbPoints  = [-321,     000,    000,    255] # K-       Blue
-    rgbPoints += [-211,     000,    255,    255] # Pi-      Cyan
-    rgbPoints += [-13,      255,    000,    255] # Mu-      Fuchsia
-    rgbPoints += [-11,      000,    255,    000] # e+       Lime
-    rgbPoints += [ 11,      255,    215,    000] # e-       Gold
-    rgbPoints += [ 13,      255,    000,    255] # Mu+      Fuchsia
-    rgbPoints += [ 211,     000,    255,    255] # Pi+      Cyan
-    rgbPoints += [ 321,     000,    000,    255] # K+       Blue
-    rgbPoints += [ 2212,    255,    000,    000] # P        Red
-    rgbPoints += [3123,     000,    000,    000] # Nuclei   Black
-
-    #rgbPoints += [22.000,   200.0,  200.0,  200.0]
-    #rgbPoints += [111.000,  0.0,    128.0,  128.0]
-    #rgbPoints += [311.000,  128.0,  0.0,    128.0]
-
-    color_lut.RGBPoints = rgbPoints
-
-    # Properties modified on scalarsLUT
-    color_lut.LockDataRange = 1
-
-    # Properties modified on scalarsLUT
-    color_lut.Discretize = 1
+else:
+    ColorBy(data_display, ("POINTS", "c"))
+    data_display.RescaleTransferFunctionToDataRange(True, False)
+    data_display.SetScalarBarVisibility(render_view, True)
+    color_lut = GetColorTransferFunction("c")
 
-    # Properties modified on scalarsLUT
-    color_lut.NumberOfTableValues = 10000
+    if args.logscale:
+        color_lut.UseLogScale = 1
+    else:
+        color_lut.UseLogScale = 0
 
-else:
     color_lut.ApplyPreset('jet', True)
     #color_lut.ApplyPreset('Grayscale', True)
 
@@ -0,0 +1,193 @@
+import argparse
+import multiprocessing
+import numpy as np
+import os
+import struct
+import zlib
+import ROOT
+import pdg_colors
+
+
+
+#### load arguments
+parser = argparse.ArgumentParser()
+parser.add_argument("root_file")
+parser.add_argument("-c", "--color",        default="dq",           help="Select the tree entry to use as color. Default: %(default)s.")
+parser.add_argument("-l", "--logscale",     action='store_true',    help="Use logarithmic color scaling.")
+parser.add_argument("-e", "--event",        nargs='*',              help="Select the event numbers. Default: all.",                              type=int)
+parser.add_argument("-o", "--output",       default="thumbnails",   help="Select the output directory. Default: %(default)s.")
+parser.add_argument("-s", "--size",         default="128",          help="Select the size of each projection in pixels. Default: %(default)s.",   type=int)
+parser.add_argument("-j", "--jobs",         default=None,           help="Select the number of processes. Default: number of CPUs.",            type=int)
+
+
+
+# Define coloring
+#=================
+# ParaView 'jet' preset, same as used by the 3D event display
+jet_points  = [-1.,         0.,     0.,     0.5625]
+jet_points += [-0.777778,   0.,     0.,     1.    ]
+jet_points += [-0.269841,   0.,     1.,     1.    ]
+jet_points += [-0.015873,   0.5,    1.,     0.5   ]
+jet_points += [ 0.238095,   1.,     1.,     0.    ]
+jet_points += [ 0.746032,   1.,     0.,     0.    ]
+jet_points += [ 1.,         0.5,    0.,     0.    ]
+jet_points  = np.reshape(jet_points, (-1,4))
+
+background = np.array([0.4, 0.4, 0.4])*255.
+outline    = np.array([1.0, 1.0, 1.0])*255.
+
+
+
+# Define 2x2 geometry
+#=====================
+# all coordinates in tree units [cm], everything spans [-70,70] in x, y and z.
+# The tree z is the display Y axis and the tree y the display Z axis, so the
+# four modules are split at x=0 and z=0 and are 140 long along y.
+extent = 70.
+
+module_edges = {"x": [-70., 0., 70.], "y": [-70., 70.], "z": [-70., 0., 70.]}
+
+projections = [("x","y"), ("x","z"), ("z","y")]
+
+
+
+#### read and store data
+def read_events(root_file_name, color, events=None):
+    """Read all (selected) events in one pass, returns {ev: (N,4) array of x,y,z,c}."""
+    hits = {}
+
+    root_file = ROOT.TFile(root_file_name, "READ")
+    try:
+        tree = root_file.Get("argon")
+        tree.SetBranchStatus("*", 1)
+
+        for i in range(tree.GetEntries()):
+
+            tree.GetEntry(i)
+
+            if events is not None and tree.ev not in events:
+                continue
+
+            if "q" in color:
+                entry = np.transpose(np.vstack((tree.xq, tree.yq, tree.zq, getattr(tree, color))))
+            else:
+                entry = np.transpose(np.vstack((tree.xq, tree.yq, tree.zq, np.full(tree.nq, getattr(tree, color)))))
+
+            hits.setdefault(int(tree.ev), []).append(entry)
+
+    finally:
+        root_file.Close()
+
+    return dict((ev, np.reshape(np.concatenate(entries), (-1,4))) for ev, entries in hits.items())
+
+
+
+#### render projections
+def pixel_index(values, size):
+    """Map coordinates in [-extent,extent] to pixel indices, out-of-range hits get -1."""
+    index = np.floor((values + extent) / (2.*extent) * size).astype(int)
+    index[(index < 0) | (index >= size)] = -1
+    return index
+
+def jet(values):
+    """Map normalized values in [0,1] to RGB [0,255] with the 'jet' preset."""
+    x = 2.*values - 1.
+    return np.transpose([np.interp(x, jet_points[:,0], jet_points[:,i]) for i in (1,2,3)])*255.
+
+def render_projection(data, axes, size, color, logscale):
+    """Histogram the hits onto one plane and return a (size,size,3) uint8 image."""
+    column = {"x": 0, "y": 1, "z": 2}
+    u = pixel_index(data[:,column[axes[0]]], size)
+    v = pixel_index(data[:,column[axes[1]]], size)
+    inside = (u >= 0) & (v >= 0)
+    pixel = (size - 1 - v[inside])*size + u[inside]
+
+    image = np.tile(background, (size*size,1))
+
+    # module outlines
+    for edge in module_edges[axes[0]]:
+        image[np.arange(size)*size + min(int((edge+extent)/(2.*extent)*size), size-1)] = outline
+    for edge in module_edges[axes[1]]:
+        image[(size - 1 - min(int((edge+extent)/(2.*extent)*size), size-1))*size + np.arange(size)] = outline
+
+    if color == "pidq":
+        # last hit per pixel wins, PDG codes can not be summed
+        image[pixel] = pdg_colors.pdg_rgb(data[inside,3])
+
+    else:
+        weight = np.bincount(pixel, weights=data[inside,3], minlength=size*size)
+        filled = np.bincount(pixel, minlength=size*size) > 0
+
+        if logscale:
+            filled &= weight > 0
+            weight[filled] = np.log10(weight[filled])
+
+        if filled.any():
+            low, high = weight[filled].min(), weight[filled].max()
+            scaled = (weight[filled] - low) / (high - low) if high > low else np.full(filled.sum(), 0.5)
+            image[filled] = jet(scaled)
+
+    return np.reshape(image, (size,size,3)).astype(np.uint8)
+
+def render_event(data, size, color, logscale):
+    """Place the XY, XZ and ZY projections side by side, separated by a 2 px gap."""
+    gap = np.tile(background, (size,2,1)).astype(np.uint8)
+    panels = []
+    for axes in projections:
+        panels += [render_projection(data, axes, size, color, logscale), gap]
+    return np.concatenate(panels[:-1], axis=1)
+
+
+
+#### write output
+def write_png(file_name, image):
+    """Write an (h,w,3) uint8 image as PNG using zlib only."""
+    def chunk(tag, content):
+        return struct.pack(">I", len(content)) + tag + content + struct.pack(">I", zlib.crc32(tag + content) & 0xffffffff)
+
+    height, width = image.shape[:2]
+    raw = np.concatenate((np.zeros((height,1), np.uint8), np.reshape(image, (height,width*3))), axis=1)
+
+    with open(file_name, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n")
+        png_file.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        png_file.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 1)))
+        png_file.write(chunk(b"IEND", b""))
+
+def write_index(file_name, events, args):
+    """Write a contact sheet linking all thumbnails."""
+    with open(file_name, "w") as html_file:
+        html_file.write("<html>\n<head><title>%s</title></head>\n" % os.path.basename(args.root_file))
+        html_file.write("<body style=\"background:#666;color:#fff;font-family:sans-serif\">\n")
+        html_file.write("<p>%s &mdash; color: %s%s &mdash; projections: XY, XZ, ZY</p>\n" % (args.root_file, args.color, " (log)" if args.logscale else ""))
+        if args.color == "pidq":
+            html_file.write("<p>%s</p>\n" % " ".join("<span style=\"background:#%02x%02x%02x\">&nbsp;&nbsp;&nbsp;</span> %s" % (tuple(pdg_colors.pdg_palette[i]) + (label,))
+                for i, (label, codes, rgb) in enumerate(pdg_colors.pdg_classes)))
+        for ev in events:
+            html_file.write("<div style=\"display:inline-block;margin:4px\"><img src=\"ev%d.png\"><br>ev %d</div>\n" % (ev, ev))
+        html_file.write("</body>\n</html>\n")
+
+def process_event(job):
+    ev, data, args = job
+    write_png(os.path.join(args.output, "ev%d.png" % ev), render_event(data, args.size, args.color, args.logscale))
+    return ev
+
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+
+    hits = read_events(args.root_file, args.color, args.event)
+    events = sorted(hits)
+
+    pool = multiprocessing.Pool(args.jobs)
+    try:
+        pool.map(process_event, [(ev, hits[ev], args) for ev in events], chunksize=16)
+    finally:
+        pool.close()
+        pool.join()
+
+    write_index(os.path.join(args.output, "index.html"), events, args)
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+
+# Define PDG classes
+#====================
+# (legend label, PDG codes, RGB), same colors as the former 'pidq' RGBPoints
+pdg_classes  = [("K+/-",    [-321, 321],    [000, 000, 255])] # Blue
+pdg_classes += [("Pi+/-",   [-211, 211],    [000, 255, 255])] # Cyan
+pdg_classes += [("Mu+/-",   [-13, 13],      [255, 000, 255])] # Fuchsia
+pdg_classes += [("e+",      [-11],          [000, 255, 000])] # Lime
+pdg_classes += [("e-",      [11],           [255, 215, 000])] # Gold
+pdg_classes += [("P",       [2212],         [255, 000, 000])] # Red
+pdg_classes += [("Nuclei",  [3123],         [000, 000, 000])] # Black
+pdg_classes += [("Other",   [],             [255, 255, 255])] # White
+
+other = len(pdg_classes) - 1
+
+pdg_palette = np.array([rgb for label, codes, rgb in pdg_classes], dtype=np.uint8)
+
+pdg_codes   = np.array([code for label, codes, rgb in pdg_classes for code in codes])
+pdg_index   = np.array([i for i, (label, codes, rgb) in enumerate(pdg_classes) for code in codes])
+pdg_index   = pdg_index[np.argsort(pdg_codes)]
+pdg_codes   = np.sort(pdg_codes)
+
+pdg_header  = "pid_class,r,g,b"
+
+
+
+#### map PDG codes
+def pdg_class(codes):
+    """Class index per PDG code, ion codes (10LZZZAAAI) count as nuclei, unknown codes as other."""
+    codes = np.rint(np.asarray(codes, dtype=float)).astype(np.int64)
+    position = np.clip(np.searchsorted(pdg_codes, codes), 0, len(pdg_codes)-1)
+    classes = np.where(pdg_codes[position] == codes, pdg_index[position], other)
+    classes[np.abs(codes) >= 1000000000] = pdg_index[pdg_codes == 3123][0]
+    return classes
+
+def pdg_rgb(codes):
+    """uint8 RGB per PDG code."""
+    return pdg_palette[pdg_class(codes)]
+
+def pdg_columns(codes):
+    """Columns pid_class,r,g,b to append to the x,y,z,c table."""
+    classes = pdg_class(codes)
+    return np.column_stack((classes, pdg_palette[classes]))
+
+
+
+#### show in paraview
+def pdg_color_source(source):
+    """Combine the r,g,b columns of a table with pdg_columns into an unsigned char 'rgb' point array."""
+    from paraview.simple import Calculator
+
+    rgb = Calculator(Input=source)
+    rgb.ResultArrayName = "rgb"
+    rgb.ResultArrayType = 'Unsigned Char'
+    rgb.Function = "r*iHat+g*jHat+b*kHat"
+
+    return rgb
+
+def show_pdg_colors(rgb, view):
+    """Show a pdg_color_source using its RGB directly, plus a categorical legend."""
+    from paraview.simple import Show, ColorBy, GetColorTransferFunction, GetScalarBar
+
+    rgb_display = Show(rgb, view)
+    ColorBy(rgb_display, ("POINTS", "rgb"))
+    rgb_display.MapScalars = 0
+
+    # legend only, not used for the mapping
+    class_lut = GetColorTransferFunction("pid_class")
+    class_lut.InterpretValuesAsCategories = 1
+    class_lut.Annotations = [str(v) for i, (label, codes, color) in enumerate(pdg_classes) for v in (i, label)]
+    class_lut.IndexedColors = (pdg_palette/255.).ravel().tolist()
+
+    class_bar = GetScalarBar(class_lut, view)
+    class_bar.Title = "PDG"
+    class_bar.Visibility = 1
+
+    return rgb_display